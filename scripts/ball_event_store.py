@@ -0,0 +1,198 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Columns holding runs; the raw data mixes numbers with placeholder strings, so they are coerced to float
+NUMERIC_COLUMNS = ['Batsman_Scored', 'Extra_Runs']
+
+# Columns with a CSR offset index (sorted keys + row offsets)
+INDEX_COLUMNS = ['Match_Id', 'Batsman_Id', 'Bowler_Id']
+
+# Dismissal types credited to the bowler (as in mergeing_script_2.py)
+BOWLER_DISMISSALS = ['caught', 'bowled', 'lbw', 'stumped', 'hit wicket', 'caught and bowled']
+
+METADATA_FILE = 'metadata.json'
+
+
+def _encode_column(values, name):
+    """
+    Convert one DataFrame column to a fixed-width array; strings become int16 codes into a category list
+    (int32 when there are more categories than int16 can hold).
+    """
+    if name in NUMERIC_COLUMNS:
+        return pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float32), None
+    if pd.api.types.is_integer_dtype(values):
+        return values.to_numpy(dtype=np.int64 if values.abs().max() >= 2 ** 31 else np.int32), None
+    if pd.api.types.is_numeric_dtype(values):
+        numeric = values.to_numpy(dtype=np.float64)
+        if np.isnan(numeric).any() or not np.equal(np.mod(numeric, 1), 0).all():
+            return numeric, None
+        return numeric.astype(np.int32), None
+    codes, categories = pd.factorize(values.astype('string').str.strip(), use_na_sentinel=True)
+    code_dtype = np.int16 if len(categories) <= np.iinfo(np.int16).max else np.int32
+    return codes.astype(code_dtype), [str(category) for category in categories]
+
+
+def build_ball_event_store(ball_by_ball_df, store_path):
+    """
+    Write the cleaned ball-by-ball table as memory-mappable column arrays with CSR offset indexes.
+
+    Rows are stored ordered by Match_Id, so a match is one contiguous slice; Batsman_Id and Bowler_Id
+    get a row permutation grouped by player. Each index is a sorted key array plus offsets, so the rows
+    of key keys[i] are positions offsets[i]:offsets[i + 1].
+    """
+    os.makedirs(store_path, exist_ok=True)
+    ball_by_ball_df = ball_by_ball_df.iloc[np.argsort(ball_by_ball_df['Match_Id'].to_numpy(), kind='stable')]
+
+    metadata = {'n_rows': len(ball_by_ball_df), 'columns': {}, 'indexes': []}
+    arrays = {}
+    for name in ball_by_ball_df.columns:
+        array, categories = _encode_column(ball_by_ball_df[name].reset_index(drop=True), name)
+        np.save(os.path.join(store_path, f'{name}.npy'), array)
+        arrays[name] = array
+        metadata['columns'][name] = {'dtype': array.dtype.str, 'categories': categories}
+
+    for name in INDEX_COLUMNS:
+        if name not in arrays:
+            continue
+        ids = arrays[name]
+        valid_rows = np.flatnonzero(~np.isnan(ids)) if ids.dtype.kind == 'f' else np.arange(len(ids))
+        rows = valid_rows[np.argsort(ids[valid_rows], kind='stable')]
+        keys, counts = np.unique(ids[rows], return_counts=True)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        np.save(os.path.join(store_path, f'index_{name}_keys.npy'), keys)
+        np.save(os.path.join(store_path, f'index_{name}_offsets.npy'), offsets)
+        if name != 'Match_Id':
+            np.save(os.path.join(store_path, f'index_{name}_rows.npy'), rows.astype(np.int32))
+        metadata['indexes'].append(name)
+
+    with open(os.path.join(store_path, METADATA_FILE), 'w') as metadata_file:
+        json.dump(metadata, metadata_file, indent=2)
+    return metadata
+
+
+class BallEventStore:
+    """
+    Read-only, memory-mapped view of a store written by build_ball_event_store().
+
+    Arrays are opened lazily with np.load(mmap_mode='r'): reading a slice only touches its pages, and
+    processes opening the same store share them through the OS page cache. The object pickles as its
+    path, so it can be handed to multiprocessing workers.
+    """
+
+    def __init__(self, store_path):
+        self.store_path = store_path
+        with open(os.path.join(store_path, METADATA_FILE)) as metadata_file:
+            self.metadata = json.load(metadata_file)
+        self._arrays = {}
+
+    def __getstate__(self):
+        return {'store_path': self.store_path}
+
+    def __setstate__(self, state):
+        self.__init__(state['store_path'])
+
+    def __len__(self):
+        return self.metadata['n_rows']
+
+    @property
+    def columns(self):
+        return list(self.metadata['columns'])
+
+    def _load(self, file_name):
+        array = self._arrays.get(file_name)
+        if array is None:
+            array = self._arrays[file_name] = np.load(os.path.join(self.store_path, file_name), mmap_mode='r')
+        return array
+
+    def column(self, name):
+        """
+        Memory-mapped array of one column (string columns as integer codes, -1 for missing).
+        """
+        return self._load(f'{name}.npy')
+
+    def categories(self, name):
+        return self.metadata['columns'][name]['categories']
+
+    def category_codes(self, name, values):
+        """
+        Codes of the given string values in a categorical column (values not present are skipped).
+        """
+        categories = self.categories(name)
+        return [categories.index(value) for value in values if value in categories]
+
+    def _span(self, index_name, key):
+        keys = self._load(f'index_{index_name}_keys.npy')
+        position = np.searchsorted(keys, key)
+        if position == len(keys) or keys[position] != key:
+            return 0, 0
+        offsets = self._load(f'index_{index_name}_offsets.npy')
+        return int(offsets[position]), int(offsets[position + 1])
+
+    def match_rows(self, match_id):
+        """
+        Row slice of one match; columns indexed with it are zero-copy views.
+        """
+        return slice(*self._span('Match_Id', match_id))
+
+    def player_rows(self, index_name, player_id):
+        """
+        Row numbers of one Batsman_Id / Bowler_Id, in stored (match) order.
+        """
+        start, stop = self._span(index_name, player_id)
+        return self._load(f'index_{index_name}_rows.npy')[start:stop]
+
+    def batsman_rows(self, batsman_id):
+        return self.player_rows('Batsman_Id', batsman_id)
+
+    def bowler_rows(self, bowler_id):
+        return self.player_rows('Bowler_Id', bowler_id)
+
+    def events(self, rows, columns=None):
+        """
+        DataFrame of the given rows with string columns decoded.
+        """
+        data = {}
+        for name in columns or self.columns:
+            values = self.column(name)[rows]
+            categories = self.categories(name)
+            if categories is not None:
+                values = pd.Categorical.from_codes(values, categories=categories)
+            data[name] = values
+        return pd.DataFrame(data)
+
+    def match_events(self, match_id, columns=None):
+        return self.events(self.match_rows(match_id), columns)
+
+    def batsman_events(self, batsman_id, columns=None):
+        return self.events(self.batsman_rows(batsman_id), columns)
+
+    def bowler_events(self, bowler_id, columns=None):
+        return self.events(self.bowler_rows(bowler_id), columns)
+
+
+def batting_summary(store, batsman_id):
+    """
+    Batting metrics of one player (as in feature_enginnering.py), read from that player's rows only.
+    """
+    runs = store.column('Batsman_Scored')[store.batsman_rows(batsman_id)]
+    total_runs = np.nansum(runs)
+    balls_faced = len(runs)
+    boundaries = int(((runs == 4) | (runs == 6)).sum())
+    return {
+        'total_runs': float(total_runs),
+        'balls_faced': balls_faced,
+        'boundaries': boundaries,
+        'strike_rate': total_runs / balls_faced * 100 if balls_faced else np.nan,
+        'boundary_percentage': boundaries / balls_faced * 100 if balls_faced else np.nan,
+    }
+
+
+def bowler_wickets(store, bowler_id):
+    """
+    Dismissals credited to one bowler (as in mergeing_script_2.py), read from that bowler's rows only.
+    """
+    dismissals = store.column('Dissimal_Type')[store.bowler_rows(bowler_id)]
+    return int(np.isin(dismissals, store.category_codes('Dissimal_Type', BOWLER_DISMISSALS)).sum())
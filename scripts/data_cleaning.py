@@ -1,6 +1,8 @@
 import pandas as pd
 import os
 
+from ball_event_store import build_ball_event_store
+
 def load_datasets(data_path):
     """Load all IPL datasets."""
     datasets = {
@@ -93,4 +95,7 @@ if __name__ == "__main__":
     # Save cleaned datasets
     save_cleaned_data(datasets, output_path)
 
+    # Build the memory-mapped ball-event store with per-match / per-player offset indexes
+    build_ball_event_store(datasets["ball_by_ball"], os.path.join(output_path, "ball_event_store"))
+
     print("Data cleaning completed. Cleaned datasets are saved in the 'outputs/' directory.")
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Parameters (same defaults as the GA / SA / greedy scripts)
+SQUAD_SIZE = 17
+OVERSEAS_LIMIT = 6
+COMPOSITION = {'Batsman': 6, 'Bowler': 6, 'All-Rounder': 3, 'Wicketkeeper': 2}
+ROLES = ['Batsman', 'Bowler', 'All-Rounder', 'Wicketkeeper']
+
+# Role priority when a player appears in several rows with different roles (Is_Keeper differs per team)
+ROLE_PRIORITY = {'Wicketkeeper': 0, 'All-Rounder': 1, 'Bowler': 2, 'Batsman': 3}
+
+
+def prepare_player_pool(players):
+    """
+    Collapse the merged dataset to one row per Player_Id.
+    A player that kept wicket for any team is treated as a Wicketkeeper, matching the role rules.
+    """
+    pool = players.copy()
+    pool['_priority'] = pool['Role'].map(ROLE_PRIORITY).fillna(len(ROLE_PRIORITY))
+    if 'Is_Keeper' in pool.columns:
+        pool['Is_Keeper'] = pool.groupby('Player_Id')['Is_Keeper'].transform('max')
+    pool = pool.sort_values(['Player_Id', '_priority'], kind='stable').drop_duplicates(subset='Player_Id')
+    return pool.drop(columns='_priority').reset_index(drop=True)
+
+
+def player_fitness(players, extra_weights=None):
+    """
+    Per-player contribution to calculate_fitness(); the fitness of a team is the sum over its players.
+    Infinite all-rounder indices (zero economy rate) are treated as missing, as in calculate_metrics().
+    extra_weights maps extra columns (e.g. player_form.py features) to the weight they add to fitness.
+    """
+    valid_economy_rate = players['economy_rate'].replace([np.inf, -np.inf, 0], 1e-5)
+    batting_score = players['total_runs'].fillna(0).to_numpy(dtype=float)
+    bowling_score = (100 / valid_economy_rate).fillna(0).to_numpy(dtype=float)
+    all_rounder_score = players['all_rounder_index'].replace([np.inf, -np.inf], np.nan).fillna(0).to_numpy(dtype=float)
+    fitness = batting_score * 0.4 + bowling_score * 0.4 + all_rounder_score * 0.2
+    for column, weight in (extra_weights or {}).items():
+        fitness = fitness + weight * players[column].fillna(0).to_numpy(dtype=float)
+    return fitness
+
+
+def role_codes(roles):
+    """
+    Encode role names as integer codes into ROLES (-1 for unknown roles).
+    """
+    codes = pd.Series(roles).map({role: code for code, role in enumerate(ROLES)})
+    return codes.fillna(-1).to_numpy(dtype=np.int8)
+
+
+def overseas_mask(players):
+    """
+    Boolean array marking overseas (non-Indian) players.
+    """
+    return (players['Country'] != 'India').to_numpy()
+
+
+def role_prefix_sums(fitness, codes, overseas, depth):
+    """
+    Top-k fitness sums of every (role, overseas) pool for k = 0..depth.
+
+    codes is either one role assignment (players,) or a matrix of assignments (players, combinations).
+    Returns an array of shape (combinations, len(ROLES), 2, depth + 1); entries are -inf where the
+    pool holds fewer than k players.
+    """
+    order = np.argsort(-fitness, kind='stable')
+    sorted_fitness = fitness[order][:, None]
+    sorted_codes = np.asarray(codes).reshape(len(fitness), -1)[order]
+    sorted_overseas = np.asarray(overseas)[order][:, None]
+
+    prefix = np.full((sorted_codes.shape[1], len(ROLES), 2, depth + 1), -np.inf)
+    for role in range(len(ROLES)):
+        for is_overseas in (0, 1):
+            members = (sorted_codes == role) & (sorted_overseas == bool(is_overseas))
+            rank = np.cumsum(members, axis=0)
+            pool_size = rank[-1] if len(rank) else np.zeros(sorted_codes.shape[1], dtype=int)
+            for k in range(depth + 1):
+                top_k = np.where(members & (rank <= k), sorted_fitness, 0.0).sum(axis=0)
+                prefix[:, role, is_overseas, k] = np.where(pool_size >= k, top_k, -np.inf)
+    return prefix
+
+
+def solve_squads(prefix, composition=COMPOSITION, overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE):
+    """
+    Exact best squads for a batch of role-pool configurations.
+
+    Because fitness is additive, each role pool only ever contributes its top-d domestic and top-o
+    overseas players, so a small DP over (players picked, overseas picked) finds the optimum.
+    composition is a dict of role minimums or a (combinations, len(ROLES)) array of them, and
+    overseas_limit / squad_size are scalars or per-combination arrays; a prefix with a single row is
+    shared by every combination.
+    Returns (best_fitness, counts): best_fitness is -inf for infeasible configurations and counts has
+    shape (combinations, len(ROLES), 2) with the number of domestic / overseas picks per role.
+    """
+    if isinstance(composition, dict):
+        composition = [[composition.get(role, 0) for role in ROLES]]
+    minimums = np.atleast_2d(np.asarray(composition, dtype=int))
+    n_combos = max(prefix.shape[0], minimums.shape[0], np.size(overseas_limit), np.size(squad_size))
+    prefix = np.broadcast_to(prefix, (n_combos,) + prefix.shape[1:])
+    minimums = np.broadcast_to(minimums, (n_combos, len(ROLES)))
+    squad_sizes = np.broadcast_to(np.asarray(squad_size, dtype=int), (n_combos,))
+    limits = np.minimum(np.broadcast_to(np.asarray(overseas_limit, dtype=int), (n_combos,)), squad_sizes)
+    depth = prefix.shape[3] - 1
+    max_squad, max_limit = int(squad_sizes.max()), int(limits.max())
+
+    # States with more overseas players than a combination allows are never reachable for it
+    over_limit = np.arange(max_limit + 1)[None, None, :] > limits[:, None, None]
+    dp = np.full((n_combos, max_squad + 1, max_limit + 1), -np.inf)
+    dp[:, 0, 0] = 0.0
+    choices = []
+    for role in range(len(ROLES)):
+        best = np.full_like(dp, -np.inf)
+        pick = np.zeros(dp.shape + (2,), dtype=np.int16)
+        for domestic in range(min(depth, max_squad) + 1):
+            for overseas in range(min(depth, max_limit, max_squad - domestic) + 1):
+                taken = domestic + overseas
+                gain = prefix[:, role, 0, domestic] + prefix[:, role, 1, overseas]
+                gain = np.where(taken < minimums[:, role], -np.inf, gain)
+                if np.isneginf(gain).all():
+                    continue
+                candidate = dp[:, :max_squad + 1 - taken, :max_limit + 1 - overseas] + gain[:, None, None]
+                region = best[:, taken:, overseas:]
+                better = candidate > region
+                region[better] = candidate[better]
+                pick[:, taken:, overseas:][better] = (domestic, overseas)
+        dp = np.where(over_limit, -np.inf, best)
+        choices.append(pick)
+
+    combos = np.arange(n_combos)
+    final = dp[combos, squad_sizes, :]
+    best_fitness = final.max(axis=1)
+    counts = np.zeros((n_combos, len(ROLES), 2), dtype=int)
+    picked = squad_sizes.copy()
+    overseas_picked = final.argmax(axis=1)
+    for role in reversed(range(len(ROLES))):
+        domestic, overseas = choices[role][combos, picked, overseas_picked].T
+        counts[:, role, 0] = domestic
+        counts[:, role, 1] = overseas
+        picked = picked - domestic - overseas
+        overseas_picked = overseas_picked - overseas
+    counts[np.isneginf(best_fitness)] = 0
+    return best_fitness, counts
+
+
+def squad_indices(fitness, codes, overseas, counts):
+    """
+    Row indices of the squad described by counts (one role assignment, counts of shape (len(ROLES), 2)).
+    """
+    order = np.argsort(-fitness, kind='stable')
+    selected = []
+    for role in range(len(ROLES)):
+        for is_overseas in (0, 1):
+            members = order[(codes[order] == role) & (overseas[order] == bool(is_overseas))]
+            selected.append(members[:counts[role, is_overseas]])
+    return np.concatenate(selected)
+
+
+def fast_optimizer(players, composition=COMPOSITION, overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE,
+                   extra_weights=None):
+    """
+    Select the optimal team in one exact pass over the player pool.
+    Returns (team, fitness); team is empty and fitness -inf if the constraints cannot be met.
+    """
+    pool = prepare_player_pool(players)
+    fitness = player_fitness(pool, extra_weights)
+    codes = role_codes(pool['Role'])
+    overseas = overseas_mask(pool)
+    prefix = role_prefix_sums(fitness, codes, overseas, squad_size)
+    best_fitness, counts = solve_squads(prefix, composition, overseas_limit, squad_size)
+    if np.isneginf(best_fitness[0]):
+        return pool.iloc[[]], best_fitness[0]
+    team = pool.iloc[squad_indices(fitness, codes, overseas, counts[0])]
+    return team, best_fitness[0]
+
+
+if __name__ == "__main__":
+    players_data = pd.read_csv('merged_player_data_with_roles_and_wickets_new.csv')
+    optimal_team, optimal_score = fast_optimizer(players_data)
+    print(f"Optimal Team Score: {optimal_score:.2f}")
+    print("Optimal Team:")
+    print(optimal_team)
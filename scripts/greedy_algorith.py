@@ -1,5 +1,10 @@
+import heapq
+import itertools
+
 import pandas as pd
 
+from fast_optimizer import ROLES, overseas_mask, player_fitness, prepare_player_pool, role_codes
+
 # Load player data (merged data for all players)
 players_data = pd.read_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project_2/merged_player_data_with_roles_and_wickets_new.csv')
 
@@ -7,52 +12,167 @@ players_data = pd.read_csv('C:/Users/Aditya/OneDrive - University of Hertfordshi
 SQUAD_SIZE = 17
 OVERSEAS_LIMIT = 6
 COMPOSITION = {'Batsman': 6, 'Bowler': 6, 'All-Rounder': 3, 'Wicketkeeper': 2}
+MAX_SWAP_ROUNDS = 100
 
 # Fitness function
 def calculate_fitness(team):
     """
     Calculate fitness of a team based on batting, bowling, and all-rounder contributions.
+    Uses the same per-player scores the greedy selection optimises (infinite all-rounder indices count as missing).
+    """
+    return player_fitness(team).sum()
+
+# Heap of the unselected players of one (role, overseas) pool, best fitness first
+def _build_heaps(fitness, codes, overseas):
+    heaps = {(role, is_overseas): [] for role in range(len(ROLES)) for is_overseas in (0, 1)}
+    for index in range(len(fitness)):
+        if codes[index] >= 0:
+            heaps[(codes[index], int(overseas[index]))].append((-fitness[index], index))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+    return heaps
+
+def _heap_heads(heap, count):
+    """
+    Best `count` unselected players of a pool, without removing them from the heap.
+    """
+    heads = [heapq.heappop(heap) for _ in range(min(count, len(heap)))]
+    for head in heads:
+        heapq.heappush(heap, head)
+    return [index for _, index in heads]
+
+def _remove_from_heap(heap, index):
+    """
+    Remove one of the best unselected players of a pool, keeping the others on the heap.
+    """
+    skipped = []
+    while True:
+        entry = heapq.heappop(heap)
+        if entry[1] == index:
+            break
+        skipped.append(entry)
+    for entry in skipped:
+        heapq.heappush(heap, entry)
+
+def _can_complete(need, heaps, overseas_left, slots_left):
+    """
+    Check that the remaining role minimums and squad slots can still be filled within the overseas cap.
     """
-    valid_economy_rate = team['economy_rate'].replace([float('inf'), float('-inf'), 0], 1e-5)
-    batting_score = team['total_runs'].sum()
-    bowling_score = (100 / valid_economy_rate).sum()
-    all_rounder_score = team['all_rounder_index'].sum()
-    return batting_score * 0.4 + bowling_score * 0.4 + all_rounder_score * 0.2
+    if sum(need) > slots_left:
+        return False
+    overseas_required = 0
+    for role, role_need in enumerate(need):
+        domestic, foreign = len(heaps[(role, 0)]), len(heaps[(role, 1)])
+        if role_need > domestic + foreign:
+            return False
+        overseas_required += max(0, role_need - domestic)
+    domestic_total = sum(len(heaps[(role, 0)]) for role in range(len(ROLES)))
+    foreign_total = sum(len(heaps[(role, 1)]) for role in range(len(ROLES)))
+    return overseas_required <= overseas_left and domestic_total + min(foreign_total, overseas_left) >= slots_left
 
 # Greedy selection function
-def greedy_algorithm(players):
+def greedy_algorithm(players, composition=COMPOSITION, overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE,
+                     max_swap_rounds=MAX_SWAP_ROUNDS, extra_weights=None):
     """
-    Select the optimal team using a greedy approach based on player performance metrics.
+    Select the optimal team using a greedy approach based on each player's fitness contribution.
+
+    Players are taken best-first from per-(role, overseas) heaps, skipping any pick that would make the
+    role minimums or the overseas limit unreachable, so the squad is always full and valid. A bounded
+    1-swap / 2-swap pass then replaces the weakest picks while that improves fitness.
+    """
+    pool = prepare_player_pool(players)
+    fitness = player_fitness(pool, extra_weights)
+    codes = role_codes(pool['Role'])
+    overseas = overseas_mask(pool)
+    heaps = _build_heaps(fitness, codes, overseas)
+    minimums = [composition.get(role, 0) for role in ROLES]
+
+    need = list(minimums)
+    overseas_left = min(overseas_limit, squad_size)
+    slots_left = squad_size
+    if not _can_complete(need, heaps, overseas_left, slots_left):
+        raise ValueError("No squad satisfies the composition and overseas limit with this player pool")
+
+    # Greedy fill: best available player whose selection keeps the squad completable
+    selected = {group: [] for group in heaps}
+    while slots_left > 0:
+        flex_slots = slots_left - sum(need)
+        candidates = []
+        for (role, is_overseas), heap in heaps.items():
+            if heap and (need[role] > 0 or flex_slots > 0) and (overseas_left > 0 or not is_overseas):
+                candidates.append((heap[0], (role, is_overseas)))
+        for (_, index), (role, is_overseas) in sorted(candidates):
+            heapq.heappop(heaps[(role, is_overseas)])
+            remaining_need = list(need)
+            remaining_need[role] = max(0, need[role] - 1)
+            if _can_complete(remaining_need, heaps, overseas_left - is_overseas, slots_left - 1):
+                break
+            heapq.heappush(heaps[(role, is_overseas)], (-fitness[index], index))
+        need = remaining_need
+        selected[(role, is_overseas)].append(index)
+        overseas_left -= is_overseas
+        slots_left -= 1
+
+    _swap_polish(selected, heaps, fitness, minimums, min(overseas_limit, squad_size), max_swap_rounds)
+
+    team_indices = [index for role in range(len(ROLES)) for is_overseas in (0, 1)
+                    for index in sorted(selected[(role, is_overseas)], key=lambda i: -fitness[i])]
+    return pool.iloc[team_indices]
+
+def _swap_polish(selected, heaps, fitness, minimums, overseas_limit, max_rounds):
+    """
+    Apply the best improving 1-swap (or, failing that, 2-swap) until none improves or max_rounds is hit.
+    Each move's fitness delta is the sum of incoming minus outgoing contributions.
     """
-    team = pd.DataFrame()
-    remaining_players = players.copy()
-
-    # Select players for each role
-    for role, count in COMPOSITION.items():
-        role_players = remaining_players[remaining_players['Role'] == role].sort_values(
-            by=['total_runs', 'strike_rate', 'boundary_percentage'], ascending=False
-        ).head(count)
-        team = pd.concat([team, role_players])
-        remaining_players = remaining_players[~remaining_players['Player_Id'].isin(role_players['Player_Id'])]
-
-    # Enforce foreign player limit
-    foreign_players = team[team['Country'] != 'India']
-    if len(foreign_players) > OVERSEAS_LIMIT:
-        excess_count = len(foreign_players) - OVERSEAS_LIMIT
-        foreign_players_to_remove = foreign_players.tail(excess_count)
-        team = team[~team['Player_Id'].isin(foreign_players_to_remove['Player_Id'])]
-
-        # Replace removed players with domestic players
-        for _, player in foreign_players_to_remove.iterrows():
-            replacement = remaining_players[(remaining_players['Role'] == player['Role']) & (remaining_players['Country'] == 'India')].head(1)
-            if not replacement.empty:
-                team = pd.concat([team, replacement])
-                remaining_players = remaining_players[~remaining_players['Player_Id'].isin(replacement['Player_Id'])]
-
-    # Ensure no duplicate players
-    team = team.drop_duplicates(subset='Player_Id')
-
-    return team
+    groups = list(selected)
+    for _ in range(max_rounds):
+        role_counts = [sum(len(selected[(role, is_overseas)]) for is_overseas in (0, 1)) for role in range(len(ROLES))]
+        overseas_count = sum(len(selected[(role, 1)]) for role in range(len(ROLES)))
+        worst = {group: sorted(selected[group], key=lambda i: fitness[i])[:2] for group in groups}
+        best = {group: _heap_heads(heaps[group], 2) for group in groups}
+
+        def feasible(outs, ins):
+            counts = list(role_counts)
+            foreign = overseas_count
+            for role, is_overseas in outs:
+                counts[role] -= 1
+                foreign -= is_overseas
+            for role, is_overseas in ins:
+                counts[role] += 1
+                foreign += is_overseas
+            return foreign <= overseas_limit and all(count >= minimum for count, minimum in zip(counts, minimums))
+
+        best_move, best_delta = None, 1e-9
+        for out_group in groups:
+            for in_group in groups:
+                if worst[out_group] and best[in_group]:
+                    delta = fitness[best[in_group][0]] - fitness[worst[out_group][0]]
+                    if delta > best_delta and feasible([out_group], [in_group]):
+                        best_move = ([(out_group, worst[out_group][0])], [(in_group, best[in_group][0])])
+                        best_delta = delta
+
+        if best_move is None:
+            for out_a, out_b in itertools.combinations_with_replacement(groups, 2):
+                outs = worst[out_a][:1] + worst[out_b][1:2] if out_a == out_b else worst[out_a][:1] + worst[out_b][:1]
+                if len(outs) < 2:
+                    continue
+                for in_a, in_b in itertools.combinations_with_replacement(groups, 2):
+                    ins = best[in_a][:2] if in_a == in_b else best[in_a][:1] + best[in_b][:1]
+                    if len(ins) < 2:
+                        continue
+                    delta = fitness[ins[0]] + fitness[ins[1]] - fitness[outs[0]] - fitness[outs[1]]
+                    if delta > best_delta and feasible([out_a, out_b], [in_a, in_b]):
+                        best_move = (list(zip([out_a, out_b], outs)), list(zip([in_a, in_b], ins)))
+                        best_delta = delta
+
+        if best_move is None:
+            return
+        for group, index in best_move[0]:
+            selected[group].remove(index)
+            heapq.heappush(heaps[group], (-fitness[index], index))
+        for group, index in best_move[1]:
+            _remove_from_heap(heaps[group], index)
+            selected[group].append(index)
 
 # Select the optimal team
 optimal_team = greedy_algorithm(players_data)
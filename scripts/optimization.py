@@ -3,6 +3,8 @@ import random
 import numpy as np
 from multiprocessing import Pool
 
+from optimizer_telemetry import DISABLED_TELEMETRY, OptimizerTelemetry
+
 # Load player data (batsmen, bowlers, all-rounders)
 players_data = pd.read_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project_2/merged_player_data_with_roles_and_wickets_new.csv')  # Merged data for all players
 
@@ -42,9 +44,10 @@ def validate_constraints(team):
     )
 
 # Generate initial population
-def initialize_population(players):
+def initialize_population(players, telemetry=DISABLED_TELEMETRY):
     """
     Generate an initial population of valid teams with a foreign player limit.
+    Constraint checks are timed under the telemetry 'validation' section.
     """
     population = []
     for _ in range(POPULATION_SIZE):
@@ -62,7 +65,9 @@ def initialize_population(players):
                 continue  # Retry if the foreign player limit is exceeded
 
             # Validate constraints
-            if validate_constraints(sampled_team):
+            with telemetry.timer('validation'):
+                is_valid = validate_constraints(sampled_team)
+            if is_valid:
                 population.append(sampled_team)
                 break
     return population
@@ -132,34 +137,53 @@ def calculate_metrics(team):
     return metrics
 
 # Genetic Algorithm
-def genetic_algorithm():
+def genetic_algorithm(telemetry=DISABLED_TELEMETRY):
     """
     Optimize the team selection using a genetic algorithm.
+    Pass an OptimizerTelemetry to record per-generation fitness, diversity and section timings.
     """
-    population = initialize_population(players_data)
+    with telemetry.timer('initialization'):
+        population = initialize_population(players_data, telemetry)
     print("Initial population generated.")
     for generation in range(GENERATIONS):
         print(f"Generation {generation + 1}/{GENERATIONS}")
-        fitness_scores = [calculate_fitness(team) for team in population]
+        with telemetry.timer('fitness'):
+            fitness_scores = [calculate_fitness(team) for team in population]
+        telemetry.count('fitness_evaluations', len(population))
+        if telemetry.enabled:
+            telemetry.record(
+                generation + 1,
+                best_fitness=max(fitness_scores),
+                mean_fitness=np.mean(fitness_scores),
+                diversity=pd.concat([team['Player_Id'] for team in population]).nunique() / (len(population) * SQUAD_SIZE),
+            )
         next_generation = []
         while len(next_generation) < POPULATION_SIZE:
-            parent1 = tournament_selection(population, fitness_scores)
-            parent2 = tournament_selection(population, fitness_scores)
+            with telemetry.timer('selection'):
+                parent1 = tournament_selection(population, fitness_scores)
+                parent2 = tournament_selection(population, fitness_scores)
             if random.random() < CROSSOVER_RATE:
-                child1, child2 = crossover(parent1, parent2)
+                with telemetry.timer('crossover'):
+                    child1, child2 = crossover(parent1, parent2)
+                telemetry.count('crossovers')
             else:
                 child1, child2 = parent1.copy(), parent2.copy()
-            child1 = mutate(child1)
-            child2 = mutate(child2)
+            with telemetry.timer('mutation'):
+                child1 = mutate(child1)
+                child2 = mutate(child2)
             next_generation.extend([child1, child2])
         population = next_generation[:POPULATION_SIZE]
-    fitness_scores = [calculate_fitness(team) for team in population]
+    with telemetry.timer('fitness'):
+        fitness_scores = [calculate_fitness(team) for team in population]
+    telemetry.count('fitness_evaluations', len(population))
     best_team = population[np.argmax(fitness_scores)]
     best_score = max(fitness_scores)
     return best_team, best_score
 
 # Execute Genetic Algorithm
-optimal_team, optimal_score = genetic_algorithm()
+telemetry = OptimizerTelemetry()
+optimal_team, optimal_score = genetic_algorithm(telemetry)
+telemetry.print_summary()
 optimal_team_metrics = calculate_metrics(optimal_team)
 print("\nOptimal Team Metrics:")
 for metric, value in optimal_team_metrics.items():
@@ -168,6 +192,8 @@ for metric, value in optimal_team_metrics.items():
 metrics_df = pd.DataFrame([optimal_team_metrics])
 metrics_df.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/metrics/optimal_team_metrics.csv', index=False)
 optimal_team.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/final_output/optimal_team_new.csv', index=False)
+telemetry.to_json('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/metrics/genetic_algorithm_trace.json')
+telemetry.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/metrics/genetic_algorithm_trace.csv')
 print(f"Optimal Team Score: {optimal_score}")
 print("Optimal Team:")
 print(optimal_team)
@@ -0,0 +1,131 @@
+import json
+import math
+import time
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+_NULL_TIMER = nullcontext()
+
+
+def _json_safe(value):
+    """
+    Convert numpy scalars to Python values and non-finite floats (inf, NaN) to None, recursively.
+    """
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class _SectionTimer:
+    """
+    Context manager adding the wall time of a with-block to one telemetry section.
+    """
+
+    def __init__(self, totals, calls, section):
+        self.totals = totals
+        self.calls = calls
+        self.section = section
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.totals[self.section] += time.perf_counter() - self.start
+        self.calls[self.section] += 1
+        return False
+
+
+class OptimizerTelemetry:
+    """
+    Structured instrumentation for the optimizers: per-step records, section timers and counters.
+
+    With enabled=False every method is a cheap no-op, so optimizers can always call into it.
+    Callbacks are called with each step record as it is added.
+    """
+
+    def __init__(self, enabled=True, callbacks=None):
+        self.enabled = enabled
+        self.callbacks = list(callbacks or [])
+        self.records = []
+        self.counters = {}
+        self.section_totals = {}
+        self.section_calls = {}
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def timer(self, section):
+        """
+        Context manager timing a hot-path section (selection, crossover, mutation, fitness, validation...).
+        Each call returns its own timer, so sections can be nested or re-entered.
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        if section not in self.section_totals:
+            self.section_totals[section] = 0.0
+            self.section_calls[section] = 0
+        return _SectionTimer(self.section_totals, self.section_calls, section)
+
+    def count(self, name, amount=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self, step, **metrics):
+        """
+        Record the metrics of one generation / iteration, together with the counters so far.
+        """
+        if not self.enabled:
+            return
+        entry = {'step': step, **metrics, **self.counters}
+        self.records.append(entry)
+        for callback in self.callbacks:
+            callback(entry)
+
+    def summary(self):
+        """
+        Total time, call count and share of timed time per section, plus the final counters.
+        """
+        timed = sum(self.section_totals.values()) or 1.0
+        sections = {
+            section: {
+                'seconds': total,
+                'calls': self.section_calls[section],
+                'share': total / timed,
+            }
+            for section, total in sorted(self.section_totals.items(), key=lambda item: -item[1])
+        }
+        return {'sections': sections, 'counters': dict(self.counters), 'steps': len(self.records)}
+
+    def to_dataframe(self):
+        return pd.DataFrame(self.records)
+
+    def to_json(self, path):
+        """
+        Write the summary and records as strict JSON; non-finite values (e.g. an inf fitness) become null.
+        """
+        trace = _json_safe({'summary': self.summary(), 'records': self.records})
+        with open(path, 'w') as trace_file:
+            json.dump(trace, trace_file, indent=2, allow_nan=False)
+
+    def to_csv(self, path):
+        self.to_dataframe().to_csv(path, index=False)
+
+    def print_summary(self):
+        print("Time per section:")
+        for section, stats in self.summary()['sections'].items():
+            print(f"  {section}: {stats['seconds']:.3f}s over {stats['calls']} calls ({stats['share']:.1%})")
+        for name, value in self.counters.items():
+            print(f"  {name}: {value}")
+
+
+DISABLED_TELEMETRY = OptimizerTelemetry(enabled=False)
@@ -0,0 +1,202 @@
+from multiprocessing import Pool
+
+import numpy as np
+
+from fast_optimizer import (COMPOSITION, OVERSEAS_LIMIT, ROLES, SQUAD_SIZE, overseas_mask, player_fitness,
+                            prepare_player_pool, role_codes)
+from optimizer_telemetry import DISABLED_TELEMETRY
+
+# Parameters
+N_REPLICAS = 8
+# 100 epochs of 500 steps (50k proposals per replica) reach within ~0.01% of the exact optimum in about 1.5s;
+# 500-step work units are also large enough for worker processes to pay off on multi-core machines
+SWAP_INTERVAL = 500  # Annealing steps each replica runs between exchange rounds
+N_EPOCHS = 100
+# Fitness differences span several orders of magnitude (bowling scores reach 1e7), hence a wide ladder
+MIN_TEMPERATURE = 1.0
+MAX_TEMPERATURE = 1e6
+INITIAL_SOLUTION_ATTEMPTS = 1000
+
+# Player arrays shared with worker processes, set once per worker by _init_worker
+_problem = None
+
+
+def temperature_ladder(n_replicas=N_REPLICAS, min_temperature=MIN_TEMPERATURE, max_temperature=MAX_TEMPERATURE):
+    """
+    Geometric temperature ladder, coldest replica first.
+    """
+    if n_replicas == 1:
+        return np.array([float(min_temperature)])
+    return np.geomspace(min_temperature, max_temperature, n_replicas)
+
+
+def build_problem(players, composition=COMPOSITION, overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE,
+                  extra_weights=None):
+    """
+    Array form of the selection problem used by the replicas.
+    """
+    pool = prepare_player_pool(players)
+    codes = role_codes(pool['Role'])
+    return {
+        'pool': pool,
+        'fitness': player_fitness(pool, extra_weights),
+        'overseas': overseas_mask(pool),
+        'codes': codes,
+        'members': [np.flatnonzero(codes == role) for role in range(len(ROLES))],
+        'eligible': np.flatnonzero(codes >= 0),
+        'minimums': [composition.get(role, 0) for role in ROLES],
+        'overseas_limit': overseas_limit,
+        'squad_size': squad_size,
+    }
+
+
+def random_team(problem, rng):
+    """
+    Random valid team: role minimums first, remaining slots from any role, within the overseas limit.
+    """
+    eligible = problem['eligible']
+    for _ in range(INITIAL_SOLUTION_ATTEMPTS):
+        team = [rng.choice(members, size=minimum, replace=False)
+                for members, minimum in zip(problem['members'], problem['minimums'])]
+        team = np.concatenate(team).astype(np.int64)
+        flex_slots = problem['squad_size'] - len(team)
+        if flex_slots > 0:
+            remaining = np.setdiff1d(eligible, team)
+            team = np.concatenate([team, rng.choice(remaining, size=flex_slots, replace=False)])
+        if problem['overseas'][team].sum() <= problem['overseas_limit']:
+            return team
+    raise ValueError("Could not generate a valid initial team within the overseas limit")
+
+
+def anneal_replica(problem, replica, temperature, steps):
+    """
+    Run `steps` Metropolis moves on one replica at a fixed temperature.
+
+    A move replaces one player with a random unselected player of any role; moves that drop the outgoing
+    role below its minimum or break the overseas limit are rejected, so extra slots can change role.
+    The fitness delta is computed from the two players involved only. All randomness comes from the
+    replica's own generator.
+    """
+    fitness, overseas, codes, eligible = problem['fitness'], problem['overseas'], problem['codes'], problem['eligible']
+    minimums = problem['minimums']
+    rng = replica['rng']
+    team = replica['team'].copy()
+    selected = np.zeros(len(fitness), dtype=bool)
+    selected[team] = True
+    current_fitness = replica['fitness']
+    overseas_count = int(overseas[team].sum())
+    role_counts = np.bincount(codes[team], minlength=len(ROLES))
+    best_team, best_fitness = replica['best_team'], replica['best_fitness']
+    accepted = 0
+
+    for _ in range(steps):
+        position = rng.integers(len(team))
+        outgoing = team[position]
+        incoming = eligible[rng.integers(len(eligible))]
+        if selected[incoming]:
+            continue
+        outgoing_role, incoming_role = codes[outgoing], codes[incoming]
+        if outgoing_role != incoming_role and role_counts[outgoing_role] <= minimums[outgoing_role]:
+            continue
+        new_overseas_count = overseas_count - overseas[outgoing] + overseas[incoming]
+        if new_overseas_count > problem['overseas_limit']:
+            continue
+        delta = fitness[incoming] - fitness[outgoing]
+        if delta >= 0 or rng.random() < np.exp(delta / temperature):
+            team[position] = incoming
+            selected[outgoing], selected[incoming] = False, True
+            overseas_count = new_overseas_count
+            role_counts[outgoing_role] -= 1
+            role_counts[incoming_role] += 1
+            current_fitness += delta
+            accepted += 1
+            if current_fitness > best_fitness:
+                best_team, best_fitness = team.copy(), current_fitness
+
+    return dict(replica, team=team, fitness=current_fitness, best_team=best_team, best_fitness=best_fitness,
+                accepted=accepted, steps=steps)
+
+
+def _init_worker(problem):
+    global _problem
+    _problem = problem
+
+
+def _anneal_in_worker(args):
+    replica, temperature, steps = args
+    return anneal_replica(_problem, replica, temperature, steps)
+
+
+def parallel_tempering(players, seed=0, n_replicas=N_REPLICAS, n_workers=1, n_epochs=N_EPOCHS,
+                       swap_interval=SWAP_INTERVAL, temperatures=None, composition=COMPOSITION,
+                       overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE, extra_weights=None,
+                       telemetry=DISABLED_TELEMETRY):
+    """
+    Optimize team selection with replica-exchange (parallel tempering) simulated annealing.
+
+    Replicas anneal at the fixed temperatures of a ladder, in `n_workers` processes, and after every
+    `swap_interval` steps neighbouring replicas exchange states with the Metropolis criterion. Each
+    replica and the exchange step draw from independent streams spawned from SeedSequence(seed), so a
+    seed gives bit-identical results for any number of workers.
+    Returns (best_team, best_fitness).
+    """
+    problem = build_problem(players, composition, overseas_limit, squad_size, extra_weights)
+    if temperatures is None:
+        temperatures = temperature_ladder(n_replicas)
+    temperatures = np.asarray(temperatures, dtype=float)
+    n_replicas = len(temperatures)
+
+    streams = np.random.SeedSequence(seed).spawn(n_replicas + 1)
+    exchange_rng = np.random.default_rng(streams[-1])
+    replicas = []
+    for stream in streams[:-1]:
+        rng = np.random.default_rng(stream)
+        team = random_team(problem, rng)
+        team_fitness = problem['fitness'][team].sum()
+        replicas.append({'rng': rng, 'team': team, 'fitness': team_fitness, 'best_team': team.copy(),
+                         'best_fitness': team_fitness})
+
+    worker_pool = None
+    if n_workers > 1:
+        worker_problem = {key: value for key, value in problem.items() if key != 'pool'}
+        worker_pool = Pool(n_workers, initializer=_init_worker, initargs=(worker_problem,))
+    try:
+        for epoch in range(n_epochs):
+            with telemetry.timer('replica_steps'):
+                jobs = [(replica, temperature, swap_interval) for replica, temperature in zip(replicas, temperatures)]
+                if worker_pool is None:
+                    replicas = [anneal_replica(problem, *job) for job in jobs]
+                else:
+                    replicas = worker_pool.map(_anneal_in_worker, jobs)
+
+            # Exchange states between neighbouring temperatures, alternating even and odd pairs
+            with telemetry.timer('exchange'):
+                swaps = attempts = 0
+                for cold in range(epoch % 2, n_replicas - 1, 2):
+                    hot = cold + 1
+                    log_ratio = ((1 / temperatures[cold] - 1 / temperatures[hot]) *
+                                 (replicas[hot]['fitness'] - replicas[cold]['fitness']))
+                    attempts += 1
+                    if log_ratio >= 0 or exchange_rng.random() < np.exp(log_ratio):
+                        swaps += 1
+                        for key in ('team', 'fitness'):
+                            replicas[cold][key], replicas[hot][key] = replicas[hot][key], replicas[cold][key]
+
+            best_fitness = max(replica['best_fitness'] for replica in replicas)
+            telemetry.count('moves_proposed', sum(replica['steps'] for replica in replicas))
+            telemetry.record(
+                epoch + 1,
+                best_fitness=best_fitness,
+                mean_fitness=np.mean([replica['fitness'] for replica in replicas]),
+                acceptance_rate=sum(replica['accepted'] for replica in replicas) / (n_replicas * swap_interval),
+                swap_acceptance_rate=swaps / attempts if attempts else np.nan,
+            )
+            print(f"Epoch {epoch + 1}/{n_epochs}, Best Fitness: {best_fitness:.2f}")
+    finally:
+        if worker_pool is not None:
+            worker_pool.close()
+            worker_pool.join()
+
+    best = max(replicas, key=lambda replica: replica['best_fitness'])
+    best_team = np.sort(best['best_team'])
+    return problem['pool'].iloc[best_team], problem['fitness'][best_team].sum()
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from fast_optimizer import fast_optimizer
+
+# Parameters
+LAST_N_MATCHES = 10
+
+# Example weights for using form features as extra fitness columns (see player_fitness(extra_weights=...))
+FORM_WEIGHTS = {'recent_appearances': 10.0, 'win_rate': 100.0, 'recent_win_rate': 100.0, 'captain_rate': 50.0}
+
+
+def build_player_match_index(player_match, match):
+    """
+    CSR index from Player_Id to that player's matches in chronological order.
+
+    The rows of player_ids[i] are positions offsets[i]:offsets[i + 1] of the per-appearance arrays
+    (Match_Id, date, Team_Id, keeper / captain flags, result, league-wide match order and how many of
+    the team's matches came after this one).
+    """
+    match = match[['Match_Id', 'Match_Date', 'IS_Result', 'Match_Winner_Id']].copy()
+    match['Match_Date'] = pd.to_datetime(match['Match_Date'], format='%d-%b-%y')
+    match = match.sort_values(['Match_Date', 'Match_Id'], kind='stable')
+    match['match_order'] = np.arange(len(match))
+
+    appearances = player_match.merge(match, on='Match_Id', how='inner')
+
+    # Position of each team match counted from that team's most recent match
+    team_matches = appearances[['Team_Id', 'Match_Id', 'match_order']].drop_duplicates(['Team_Id', 'Match_Id'])
+    team_matches = team_matches.sort_values(['Team_Id', 'match_order'], ascending=[True, False], kind='stable')
+    team_matches['team_matches_after'] = team_matches.groupby('Team_Id').cumcount()
+    appearances = appearances.merge(team_matches[['Team_Id', 'Match_Id', 'team_matches_after']],
+                                    on=['Team_Id', 'Match_Id'], how='left')
+    order = np.lexsort((appearances['match_order'].to_numpy(), appearances['Player_Id'].to_numpy()))
+    appearances = appearances.iloc[order]
+
+    player_ids, counts = np.unique(appearances['Player_Id'].to_numpy(), return_counts=True)
+    has_result = (appearances['IS_Result'] == 1).to_numpy()
+    return {
+        'player_ids': player_ids,
+        'offsets': np.concatenate([[0], np.cumsum(counts)]),
+        'match_ids': appearances['Match_Id'].to_numpy(),
+        'dates': appearances['Match_Date'].to_numpy(),
+        'team_ids': appearances['Team_Id'].to_numpy(),
+        'is_keeper': (appearances['Is_Keeper'] == 1).to_numpy(),
+        'is_captain': (appearances['Is_Captain'] == 1).to_numpy(),
+        'has_result': has_result,
+        'won': has_result & (appearances['Match_Winner_Id'] == appearances['Team_Id']).to_numpy(),
+        'match_order': appearances['match_order'].to_numpy(),
+        'team_matches_after': appearances['team_matches_after'].to_numpy(),
+    }
+
+
+def player_matches(index, player_id):
+    """
+    Row slice of one player's appearances in the index arrays.
+    """
+    position = np.searchsorted(index['player_ids'], player_id)
+    if position == len(index['player_ids']) or index['player_ids'][position] != player_id:
+        return slice(0, 0)
+    return slice(index['offsets'][position], index['offsets'][position + 1])
+
+
+def compute_form_features(index, last_n=LAST_N_MATCHES):
+    """
+    Per-player form features from the CSR index, computed with segment reductions (no per-player loop).
+
+    recent_appearances counts the player's games among the last `last_n` matches of their latest team
+    (the team of their most recent appearance), and recent_win_rate is the win rate over the player's
+    own last `last_n` matches with a result.
+    """
+    offsets = index['offsets']
+    starts = offsets[:-1]
+    appearances = np.diff(offsets)
+
+    # Position of each appearance within its player's segment, counted from the most recent one
+    segment_lengths = np.repeat(appearances, appearances)
+    from_end = segment_lengths - (np.arange(offsets[-1]) - np.repeat(starts, appearances)) - 1
+    own_recent = from_end < last_n
+    latest_team = np.repeat(index['team_ids'][offsets[1:] - 1], appearances)
+    team_recent = (index['team_ids'] == latest_team) & (index['team_matches_after'] < last_n)
+
+    def segment_sum(values):
+        return np.add.reduceat(values.astype(float), starts) if len(starts) else np.zeros(0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        features = pd.DataFrame({
+            'Player_Id': index['player_ids'],
+            'appearances': appearances,
+            'recent_appearances': segment_sum(team_recent),
+            'keeper_rate': segment_sum(index['is_keeper']) / appearances,
+            'captain_matches': segment_sum(index['is_captain']),
+            'captain_rate': segment_sum(index['is_captain']) / appearances,
+            'win_rate': segment_sum(index['won']) / segment_sum(index['has_result']),
+            'recent_win_rate': segment_sum(index['won'] & own_recent) / segment_sum(index['has_result'] & own_recent),
+            'last_match_date': index['dates'][offsets[1:] - 1],
+        })
+    return features
+
+
+def attach_form_features(players, features):
+    """
+    Add the form feature columns to a player dataset (players without appearances get zeros).
+    """
+    merged = players.merge(features.drop(columns='last_match_date'), on='Player_Id', how='left')
+    feature_columns = [column for column in features.columns if column not in ('Player_Id', 'last_match_date')]
+    merged[feature_columns] = merged[feature_columns].fillna(0)
+    return merged
+
+
+if __name__ == "__main__":
+    print("Loading datasets...")
+    player_match_data = pd.read_csv('outputs/player_match_cleaned.csv')
+    match_data = pd.read_csv('outputs/match_cleaned.csv')
+    players_data = pd.read_csv('merged_player_data_with_roles_and_wickets_new.csv')
+
+    print("Building Player-Match index and form features...")
+    player_match_index = build_player_match_index(player_match_data, match_data)
+    form_features = compute_form_features(player_match_index)
+    form_features.to_csv('outputs/player_form_features.csv', index=False)
+    print("Form features saved as 'outputs/player_form_features.csv'")
+
+    # Use the form features as extra fitness columns
+    players_with_form = attach_form_features(players_data, form_features)
+    optimal_team, optimal_score = fast_optimizer(players_with_form, extra_weights=FORM_WEIGHTS)
+    print(f"Optimal Team Score (with form): {optimal_score:.2f}")
+    print(optimal_team[['Player_Name', 'Role', 'Country'] + list(FORM_WEIGHTS)])
@@ -0,0 +1,96 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from fast_optimizer import (COMPOSITION, OVERSEAS_LIMIT, ROLES, SQUAD_SIZE, overseas_mask, player_fitness,
+                            prepare_player_pool, role_prefix_sums, solve_squads)
+
+# Thresholds hardcoded in mergeing_script_2.py
+DEFAULT_THRESHOLDS = {'batsman_runs': 1000, 'all_rounder_runs': 100, 'all_rounder_wickets': 5, 'bowler_wickets': 10}
+
+# Sweep grid (8 * 6 * 5 * 6 = 1440 combinations)
+SWEEP_GRID = {
+    'batsman_runs': [250, 500, 750, 1000, 1250, 1500, 2000, 2500],
+    'all_rounder_runs': [0, 50, 100, 200, 300, 500],
+    'all_rounder_wickets': [1, 3, 5, 8, 12],
+    'bowler_wickets': [5, 10, 15, 20, 30, 40],
+}
+
+
+def threshold_grid(grid=SWEEP_GRID):
+    """
+    Expand a dict of threshold values into a DataFrame with one row per combination.
+    """
+    return pd.DataFrame(list(itertools.product(*grid.values())), columns=list(grid.keys()))
+
+
+def assign_roles_matrix(players, grid):
+    """
+    Apply the mergeing_script_2.py role rules for every threshold combination at once.
+    Returns an int8 matrix of shape (players, combinations) holding codes into ROLES.
+    """
+    runs = players['total_runs'].fillna(0).to_numpy(dtype=float)[:, None]
+    wickets = players['wickets'].fillna(0).to_numpy(dtype=float)[:, None]
+    is_keeper = (players['Is_Keeper'] == 1).to_numpy()[:, None]
+    batsman_runs = grid['batsman_runs'].to_numpy()[None, :]
+
+    batsman_condition = runs > batsman_runs
+    all_rounder_condition = ((runs > grid['all_rounder_runs'].to_numpy()[None, :]) &
+                             (wickets >= grid['all_rounder_wickets'].to_numpy()[None, :]) & ~batsman_condition)
+    bowler_condition = (wickets > grid['bowler_wickets'].to_numpy()[None, :]) & (runs <= batsman_runs)
+
+    # Later rules override earlier ones, so the conditions are listed in reverse order of assignment
+    return np.select(
+        [np.broadcast_to(is_keeper, batsman_condition.shape), bowler_condition, all_rounder_condition],
+        [ROLES.index('Wicketkeeper'), ROLES.index('Bowler'), ROLES.index('All-Rounder')],
+        default=ROLES.index('Batsman'),
+    ).astype(np.int8)
+
+
+def sweep_role_thresholds(players, grid=None, composition=COMPOSITION, overseas_limit=OVERSEAS_LIMIT,
+                          squad_size=SQUAD_SIZE, extra_weights=None):
+    """
+    Evaluate every threshold combination with the fast optimizer in one vectorized pass.
+    Returns the grid with per-role pool sizes and the best squad fitness (NaN when infeasible).
+    extra_weights adds weighted extra columns (e.g. player_form.py features) to fitness.
+    """
+    if grid is None:
+        grid = threshold_grid()
+    pool = prepare_player_pool(players)
+    fitness = player_fitness(pool, extra_weights)
+    overseas = overseas_mask(pool)
+
+    roles = assign_roles_matrix(pool, grid)
+    prefix = role_prefix_sums(fitness, roles, overseas, squad_size)
+    best_fitness, counts = solve_squads(prefix, composition, overseas_limit, squad_size)
+
+    results = grid.copy()
+    for code, role in enumerate(ROLES):
+        results[f'{role}_pool'] = (roles == code).sum(axis=0)
+    for code, role in enumerate(ROLES):
+        results[f'{role}_selected'] = counts[:, code].sum(axis=1)
+    results['overseas_selected'] = counts[:, :, 1].sum(axis=1)
+    results['feasible'] = ~np.isneginf(best_fitness)
+    results['squad_fitness'] = np.where(results['feasible'], best_fitness, np.nan)
+    return results
+
+
+if __name__ == "__main__":
+    print("Loading merged dataset...")
+    players_data = pd.read_csv('merged_player_data_with_roles_and_wickets_new.csv')
+
+    grid = threshold_grid()
+    print(f"Sweeping {len(grid)} role threshold combinations...")
+    sweep = sweep_role_thresholds(players_data, grid)
+
+    sweep.to_csv('metrics/role_threshold_sweep.csv', index=False)
+    print("Sweep saved as 'metrics/role_threshold_sweep.csv'")
+
+    baseline = sweep
+    for name, value in DEFAULT_THRESHOLDS.items():
+        baseline = baseline[baseline[name] == value]
+    print("\nCurrent thresholds:")
+    print(baseline)
+    print("\nTop threshold combinations by squad fitness:")
+    print(sweep.sort_values('squad_fitness', ascending=False).head(10))
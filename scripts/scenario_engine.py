@@ -0,0 +1,142 @@
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from fast_optimizer import (COMPOSITION, OVERSEAS_LIMIT, ROLES, SQUAD_SIZE, overseas_mask, player_fitness,
+                            prepare_player_pool, role_codes, role_prefix_sums, solve_squads, squad_indices)
+
+# Scenarios per vectorized solve, and the number of distinct scenarios worth spreading over processes
+BATCH_SIZE = 2000
+PARALLEL_MIN_SCENARIOS = 20000
+
+# Shared state of worker processes, set once per worker by _init_worker
+_worker_prefix = None
+
+
+def scenario_key(scenario):
+    """
+    Hashable key of a scenario's constraints, used to solve identical scenarios only once.
+    """
+    composition = scenario.get('composition', COMPOSITION)
+    unknown_roles = set(composition) - set(ROLES)
+    if unknown_roles:
+        raise ValueError(f"Unknown roles in composition: {sorted(unknown_roles)} (expected {ROLES})")
+    return (
+        tuple((role, composition.get(role, 0)) for role in ROLES),
+        scenario.get('overseas_limit', OVERSEAS_LIMIT),
+        scenario.get('squad_size', SQUAD_SIZE),
+    )
+
+
+def prepare_scenario_data(players, max_squad_size=SQUAD_SIZE, extra_weights=None):
+    """
+    Load-once data shared by all scenarios: player pool, fitness and per-role sorted prefix sums.
+    """
+    pool = prepare_player_pool(players)
+    fitness = player_fitness(pool, extra_weights)
+    codes = role_codes(pool['Role'])
+    overseas = overseas_mask(pool)
+    return {
+        'pool': pool,
+        'fitness': fitness,
+        'codes': codes,
+        'overseas': overseas,
+        'prefix': role_prefix_sums(fitness, codes, overseas, max_squad_size),
+    }
+
+
+def _solve_keys(prefix, keys):
+    """
+    Solve a batch of scenario keys in one vectorized solve_squads() call.
+    """
+    minimums = [[count for _, count in composition] for composition, _, _ in keys]
+    overseas_limits = [overseas_limit for _, overseas_limit, _ in keys]
+    squad_sizes = [squad_size for _, _, squad_size in keys]
+    best_fitness, counts = solve_squads(prefix, minimums, overseas_limits, squad_sizes)
+    return list(zip(best_fitness, counts))
+
+
+def _init_worker(prefix):
+    global _worker_prefix
+    _worker_prefix = prefix
+
+
+def _solve_keys_in_worker(keys):
+    return _solve_keys(_worker_prefix, keys)
+
+
+def run_scenarios(players, scenarios, processes=None, data=None, extra_weights=None):
+    """
+    Solve a list of constraint scenarios in one call and return a comparison table.
+
+    Each scenario is a dict with optional 'name', 'composition', 'overseas_limit' and 'squad_size'
+    (defaults are the optimization.py settings). Data is loaded and indexed once, duplicate scenarios
+    are solved once, and distinct scenarios are solved in vectorized batches of BATCH_SIZE. Batches are
+    spread over `processes` worker processes only when there are at least PARALLEL_MIN_SCENARIOS
+    distinct scenarios (processes=1 always solves in this process).
+    """
+    max_squad_size = max([scenario.get('squad_size', SQUAD_SIZE) for scenario in scenarios] + [SQUAD_SIZE])
+    if data is None:
+        data = prepare_scenario_data(players, max_squad_size, extra_weights)
+    elif data['prefix'].shape[3] - 1 < max_squad_size:
+        raise ValueError(f"Scenario data was prepared for squads of at most {data['prefix'].shape[3] - 1} players")
+
+    keys = [scenario_key(scenario) for scenario in scenarios]
+    unique_keys = list(dict.fromkeys(keys))
+    batches = [unique_keys[start:start + BATCH_SIZE] for start in range(0, len(unique_keys), BATCH_SIZE)]
+    if processes == 1 or len(unique_keys) < PARALLEL_MIN_SCENARIOS:
+        solutions = [solution for batch in batches for solution in _solve_keys(data['prefix'], batch)]
+    else:
+        with Pool(processes or os.cpu_count() or 1, initializer=_init_worker, initargs=(data['prefix'],)) as pool:
+            solutions = [solution for batch in pool.map(_solve_keys_in_worker, batches) for solution in batch]
+    cache = dict(zip(unique_keys, solutions))
+
+    rows = []
+    for index, (scenario, key) in enumerate(zip(scenarios, keys)):
+        best_fitness, counts = cache[key]
+        composition, overseas_limit, squad_size = key
+        feasible = not np.isneginf(best_fitness)
+        row = {
+            'scenario': scenario.get('name', f'scenario_{index}'),
+            'composition': '/'.join(str(count) for _, count in composition),
+            'overseas_limit': overseas_limit,
+            'squad_size': squad_size,
+            'feasible': feasible,
+            'squad_fitness': best_fitness if feasible else np.nan,
+        }
+        for code, role in enumerate(ROLES):
+            row[f'{role}_selected'] = counts[code].sum()
+        row['overseas_selected'] = counts[:, 1].sum()
+        if feasible:
+            selected = squad_indices(data['fitness'], data['codes'], data['overseas'], counts)
+            row['Player_Ids'] = ' '.join(str(player_id) for player_id in data['pool']['Player_Id'].iloc[selected])
+        else:
+            row['Player_Ids'] = ''
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    print("Loading merged dataset...")
+    players_data = pd.read_csv('merged_player_data_with_roles_and_wickets_new.csv')
+
+    # Composition splits used in optimization.py and new.py, over a range of overseas limits and squad sizes
+    compositions = {
+        'optimization': {'Batsman': 6, 'Bowler': 6, 'All-Rounder': 3, 'Wicketkeeper': 2},
+        'new': {'Batsman': 4, 'Bowler': 4, 'All-Rounder': 7, 'Wicketkeeper': 2},
+    }
+    scenarios = [
+        {'name': f'{label}_os{overseas_limit}_sq{squad_size}', 'composition': composition,
+         'overseas_limit': overseas_limit, 'squad_size': squad_size}
+        for label, composition in compositions.items()
+        for overseas_limit in range(0, 9)
+        for squad_size in range(17, 26)
+    ]
+
+    print(f"Solving {len(scenarios)} scenarios...")
+    comparison = run_scenarios(players_data, scenarios)
+    comparison.to_csv('metrics/scenario_comparison.csv', index=False)
+    print("Comparison saved as 'metrics/scenario_comparison.csv'")
+    print(comparison.drop(columns='Player_Ids').sort_values('squad_fitness', ascending=False).head(10))
@@ -2,6 +2,9 @@ import pandas as pd
 import random
 import numpy as np
 
+from optimizer_telemetry import DISABLED_TELEMETRY, OptimizerTelemetry
+from parallel_tempering import parallel_tempering
+
 # Load player data
 players_data = pd.read_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project_2/merged_player_data_with_roles_and_wickets_new.csv')  # Merged data for all players
 
@@ -13,6 +16,12 @@ INITIAL_TEMPERATURE = 100
 COOLING_RATE = 0.95
 MAX_ITERATIONS = 500  # Reduced for performance
 EARLY_STOPPING_ROUNDS = 50  # Stop if no improvement in this many rounds
+# Set to True for the seeded multi-replica mode instead of the single chain. Its fitness comes from
+# player_fitness(), which treats an infinite all_rounder_index as missing; calculate_fitness() scores such a team as inf.
+PARALLEL_TEMPERING = False
+SEED = 42
+N_REPLICAS = 8
+N_WORKERS = 1  # Results for a given SEED do not depend on the number of workers; raise on multi-core machines
 
 # Fitness function
 def calculate_fitness(team):
@@ -71,26 +80,39 @@ def mutate_team(team, players):
     return team  # Return the original team if no valid mutation is found
 
 # Simulated Annealing
-def simulated_annealing(players):
+def simulated_annealing(players, telemetry=DISABLED_TELEMETRY):
     """
     Optimize team selection using Simulated Annealing.
+    Pass an OptimizerTelemetry to record per-iteration fitness, temperature, acceptance rate and section timings.
     """
-    current_team = generate_initial_solution(players)
-    current_fitness = calculate_fitness(current_team)
+    with telemetry.timer('initialization'):
+        current_team = generate_initial_solution(players)
+    with telemetry.timer('fitness'):
+        current_fitness = calculate_fitness(current_team)
+    telemetry.count('fitness_evaluations')
     best_team = current_team.copy()
     best_fitness = current_fitness
     temperature = INITIAL_TEMPERATURE
     no_improvement_rounds = 0
+    accepted_moves = 0
 
     for iteration in range(MAX_ITERATIONS):
-        new_team = mutate_team(current_team.copy(), players)
-        if validate_constraints(new_team):
-            new_fitness = calculate_fitness(new_team)
+        with telemetry.timer('mutation'):
+            new_team = mutate_team(current_team.copy(), players)
+        with telemetry.timer('validation'):
+            is_valid = validate_constraints(new_team)
+        accepted = False
+        if is_valid:
+            with telemetry.timer('fitness'):
+                new_fitness = calculate_fitness(new_team)
+            telemetry.count('fitness_evaluations')
 
             # Accept new team based on fitness improvement or probabilistic acceptance
             if new_fitness > current_fitness or np.random.rand() < np.exp((new_fitness - current_fitness) / temperature):
                 current_team = new_team
                 current_fitness = new_fitness
+                accepted = True
+                accepted_moves += 1
 
                 # Update best team if current team is better
                 if current_fitness > best_fitness:
@@ -100,6 +122,15 @@ def simulated_annealing(players):
                 else:
                     no_improvement_rounds += 1
 
+        telemetry.record(
+            iteration + 1,
+            temperature=temperature,
+            current_fitness=current_fitness,
+            best_fitness=best_fitness,
+            accepted=accepted,
+            acceptance_rate=accepted_moves / (iteration + 1),
+        )
+
         # Cool down temperature
         temperature *= COOLING_RATE
 
@@ -114,12 +145,22 @@ def simulated_annealing(players):
 
     return best_team, best_fitness
 
-# Run Simulated Annealing
-optimal_team, optimal_score = simulated_annealing(players_data)
-
-# Save results
-optimal_team.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/final_output/optimal_team_simulated_annealing.csv', index=False)
-print(f"Optimal Team Score: {optimal_score:.2f}")
-print("Optimal Team:")
-print(optimal_team)
-
+# Run Simulated Annealing (guarded so worker processes can import this module)
+if __name__ == "__main__":
+    telemetry = OptimizerTelemetry()
+    if PARALLEL_TEMPERING:
+        optimal_team, optimal_score = parallel_tempering(
+            players_data, seed=SEED, n_replicas=N_REPLICAS, n_workers=N_WORKERS, composition=COMPOSITION,
+            overseas_limit=OVERSEAS_LIMIT, squad_size=SQUAD_SIZE, telemetry=telemetry,
+        )
+    else:
+        optimal_team, optimal_score = simulated_annealing(players_data, telemetry)
+    telemetry.print_summary()
+
+    # Save results
+    optimal_team.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/final_output/optimal_team_simulated_annealing.csv', index=False)
+    telemetry.to_json('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/metrics/simulated_annealing_trace.json')
+    telemetry.to_csv('C:/Users/Aditya/OneDrive - University of Hertfordshire/Project/metrics/simulated_annealing_trace.csv')
+    print(f"Optimal Team Score: {optimal_score:.2f}")
+    print("Optimal Team:")
+    print(optimal_team)